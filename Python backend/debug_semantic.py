@@ -1,12 +1,12 @@
-from sentence_transformers import SentenceTransformer, util
-import torch
+from model_utils import ModelManager
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
+manager = ModelManager()
 jd_skill = "kubernetes"
 sentence = "Deployed microservices on Kubernetes using Helm charts."
 
-jd_emb = model.encode(jd_skill, convert_to_tensor=True)
-sent_emb = model.encode(sentence, convert_to_tensor=True)
+jd_emb = manager.encode_normalized(jd_skill)
+sent_emb = manager.encode_normalized(sentence)
 
-score = util.cos_sim(jd_emb, sent_emb)[0]
+# Embeddings are normalized, so the dot product is the cosine similarity
+score = jd_emb @ sent_emb
 print(f"Similarity: {score.item()}")
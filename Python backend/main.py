@@ -1,22 +1,23 @@
 from fastapi import FastAPI, UploadFile, File
-import shutil
-from resumeParse import ResumeParser
+from typing import List
+import asyncio
+import logging
+from parsers import get_jd_parser, get_scorer, parse_upload
 from roleMatch import recommend_roles
 
 app = FastAPI()
-parser = ResumeParser()
+logger = logging.getLogger(__name__)
 
 @app.post("/analyze-resume")
 async def analyze_resume(file: UploadFile = File(...)):
-    file_path = f"temp_{file.filename}"
-
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    text = parser.extract_text(file_path)
-    resume_data = parser.parse_text(text)
-    print(resume_data)
-    roles = recommend_roles(text)
+    # Parse the upload from memory (no temp file). PDF extraction and parsing
+    # block, so keep them off the event loop; repeat uploads come from the cache
+    data = await file.read()
+    text, resume_data = await asyncio.to_thread(parse_upload, file.filename or "", data)
+    # Lazy %-formatting: the dict is only rendered when debug logging is on
+    logger.debug("parsed resume: %s", resume_data)
+    # The encode blocks too; off the loop it overlaps with other requests' parsing and scoring
+    roles = await asyncio.to_thread(recommend_roles, text)
 
     return {
         "recommended_roles": roles
@@ -25,41 +26,71 @@ async def analyze_resume(file: UploadFile = File(...)):
 
 @app.post("/parse-resume")
 async def parse_resume_endpoint(file: UploadFile = File(...)):
-    file_path = f"temp_{file.filename}"
-
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    resume_data = parser.parse_text(text)
+    data = await file.read()
+    _, resume_data = await asyncio.to_thread(parse_upload, file.filename or "", data)
     return resume_data
 
 
 from fastapi import Form
-from resumeScorer import JobDescriptionParser, ResumeScorer
-
-jd_parser = JobDescriptionParser()
-scorer = ResumeScorer()
 
 @app.post("/score-resume")
 async def score_resume_endpoint(
     file: UploadFile = File(...),
     job_description: str = Form(...)
 ):
-    # 1. Save and parse resume
-    file_path = f"temp_{file.filename}"
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
-    resume_text = parser.extract_text(file_path)
-    resume_data = parser.parse_text(resume_text)
+    jd_parser = get_jd_parser()
+    scorer = get_scorer()
     
-    # 2. Parse Job Description
-    jd_data = jd_parser.parse(job_description)
+    # 1-2. Read and parse resume, and parse the Job Description; independent, so concurrently
+    data = await file.read()
+    (_, resume_data), jd_data = await asyncio.gather(
+        asyncio.to_thread(parse_upload, file.filename or "", data),
+        asyncio.to_thread(jd_parser.parse, job_description)
+    )
     
-    # 3. Score
-    score_result = scorer.score(resume_data['skills'], jd_data, resume_sentences=resume_data.get('sentences', []))
+    # 3. Score (encodes, so off the event loop as well)
+    score_result = await asyncio.to_thread(
+        scorer.score, resume_data['skills'], jd_data, resume_sentences=resume_data.get('sentences', [])
+    )
     
     return {
         "score_details": score_result,
         "resume_data": resume_data
     }
+
+
+@app.post("/score-resumes-batch")
+async def score_resumes_batch_endpoint(
+    files: List[UploadFile] = File(...),
+    job_description: str = Form(...)
+):
+    jd_parser = get_jd_parser()
+    scorer = get_scorer()
+
+    # 1. Read and parse every resume (cached by content, see parse_upload)
+    async def parse_files():
+        resumes = []
+        for file in files:
+            data = await file.read()
+            _, resume_data = await asyncio.to_thread(parse_upload, file.filename or "", data)
+            resumes.append(resume_data)
+        return resumes
+
+    # 2. Parse Job Description, concurrently with the resumes
+    resumes, jd_data = await asyncio.gather(
+        parse_files(),
+        asyncio.to_thread(jd_parser.parse, job_description)
+    )
+
+    # 3. Score all candidates together: one embedding pass for the whole batch
+    candidates = [(r['skills'], r.get('sentences', [])) for r in resumes]
+    results = await asyncio.to_thread(scorer.score_batch, candidates, jd_data)
+
+    return [
+        {
+            "filename": file.filename,
+            "score_details": score_result,
+            "resume_data": resume_data
+        }
+        for file, score_result, resume_data in zip(files, results, resumes)
+    ]
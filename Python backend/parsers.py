@@ -0,0 +1,30 @@
+from functools import lru_cache
+from resumeParse import ResumeParser
+from resumeScorer import JobDescriptionParser, ResumeScorer
+
+# Shared instances. Each is built on first use and then reused by every request,
+# so the skill automaton, compiled regexes and the model are set up only once.
+
+@lru_cache(maxsize=1)
+def get_parser() -> ResumeParser:
+    return ResumeParser()
+
+
+@lru_cache(maxsize=1)
+def get_jd_parser() -> JobDescriptionParser:
+    return JobDescriptionParser()
+
+
+@lru_cache(maxsize=1)
+def get_scorer() -> ResumeScorer:
+    return ResumeScorer()
+
+
+def parse_upload(filename, data):
+    """
+    Return (text, resume_data) for an uploaded file. Uploads are cached by content
+    in the shared parser (see ResumeParser.parse_bytes), so the same resume scored
+    against several job descriptions skips extraction and parsing. Each call gets
+    its own copy of resume_data.
+    """
+    return get_parser().parse_bytes(filename, data)
@@ -1,10 +1,28 @@
-import pdfplumber
-from docx import Document
+import pypdfium2 as pdfium
+import ahocorasick
+import copy
+import io
 import re
 import json
 import os
+import posixpath
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from blake3 import blake3 as _content_hash
+except ImportError:  # blake3 is optional; blake2b is in the stdlib and nearly as fast
+    from hashlib import blake2b as _content_hash
 # import google.generativeai as genai
 
+# WordprocessingML names used by the DOCX text reader
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_OFFICE_DOCUMENT_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+_RUN_TEXT = {_W + 'tab': '\t', _W + 'ptab': '\t', _W + 'cr': '\n', _W + 'noBreakHyphen': '-'}
+
 class ResumeParser:
     """
     A robust resume parser that extracts structured information from resumes
@@ -20,9 +38,52 @@ class ResumeParser:
             'skills': r'\b(skills?|technical|technologies|competencies)\b',
             'achievements': r'\b(achievements?|certifications?|awards?)\b'
         }
-        
+        # All section headers in one regex. Each alternative is a lookahead over the whole
+        # line, so sections keep the priority order above; m.lastgroup names the section.
+        self._section_re = re.compile(
+            '|'.join(f'(?P<{name}>(?=.*?{pattern}))' for name, pattern in self.section_patterns.items()),
+            re.IGNORECASE
+        )
+
+        # Contact details. The phone formats are zero-width lookaheads in one alternation,
+        # so a single finditer visits every position and records each format's first hit
+        # (formats listed in priority order). Email stays separate: a consuming email
+        # match would hide a phone number glued to it ("9876543210|me@x.com").
+        self._email_re = re.compile(r"\S+@\S+")
+        self._phone_re = re.compile(
+            r'(?=(?P<phone0>\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}))'
+            r'|(?=(?P<phone1>\b\d{10}\b))'
+            r'|(?=(?P<phone2>\+\d{2}\s?\d{10}))'
+        )
+        # Per-line education fields: graduation year (last one wins) and CGPA (first one wins)
+        self._edu_fields_re = re.compile(
+            r'(?=\b(?P<year>20\d{2})\b)|(?=cgpa[:\-\s]*(?P<cgpa>[0-9.]+))'
+        )
+        # Degree, specialization and college patterns used by extract_education
+        self._degree_re = re.compile(
+            r'\b(b\.?\s*tech|bachelor|b\.?\s*e\.?|m\.?\s*tech|master|mba|bca|mca|phd)\b', re.IGNORECASE)
+        # Also match concatenated versions like "btechin"
+        self._degree_loose_re = re.compile(
+            r'(b\.?tech|btech|b-tech|bachelor|b\.?e\.?|m\.?tech|mtech|master|mba|bca|mca|phd)', re.IGNORECASE)
+        self._specialization_re = re.compile(
+            r'(computer science|computer science and engineering (data science)|information technology|data science|electronics|mechanical|'
+            r'electrical|civil|computer engineering)',
+            re.IGNORECASE)
+        self._college_re = re.compile(
+            r'([A-Z][a-zA-Z\s\.]+(?:institute|university|college|academy)[a-zA-Z\s,\.]*)', re.IGNORECASE)
+        self._whitespace_re = re.compile(r'\s+')
+        self._trailing_comma_re = re.compile(r',\s*$')
+        # Name detection skips document titles
+        self._doc_title_re = re.compile(r'\b(resume|cv|curriculum)\b', re.IGNORECASE)
+        # Skills-section lists: item separators and category prefixes
+        self._skill_sep_re = re.compile(r'[,•·:\-]')
+        self._skill_category_re = re.compile(r'^(languages|frameworks|tools|databases|cloud)\s*')
+        # Project lines: "Tech:", "Technologies Used:", "Built with", "Stack" followed by a list
+        self._tech_line_re = re.compile(r'(tech(?:nologies)?(?:\s+used)?|built\s+with|stack)[:\s]*(.+)', re.IGNORECASE)
+        self._filler_words_re = re.compile(r'\b(and|or|with)\b')
+
         # Common job roles/positions
-        self.known_roles = {
+        self.known_roles = frozenset({
             # Software Development
             'software engineer', 'software developer', 'full stack developer',
             'frontend developer', 'backend developer', 'web developer',
@@ -58,10 +119,10 @@ class ResumeParser:
             'contributor', 'volunteer', 'member', 'coordinator',
             'core member', 'technical team member', 'web developer',
             'app developer', 'research assistant'
-        }
+        })
         
         # Add these missing technologies to known_skills:
-        self.known_skills = {
+        self.known_skills = frozenset({
             # Languages
             'python', 'java', 'javascript', 'c++', 'c', 'kotlin', 'sql', 
             'typescript', 'go', 'rust', 'php', 'swift', 'r', 'scala',
@@ -95,23 +156,48 @@ class ResumeParser:
             'machine learning', 'deep learning', 'nlp', 'data science',
             'data analysis', 'cloud computing', 'devops', 'agile',
             'oop', 'oops', 'etl', 'computer vision', 'rag'  # ✅ Add RAG
-        }
-    
-    def fix_spacing(self, text):
-        """Fix spacing issues in PDF extracted text."""
-        
-        # 1. Fix: "DeveloperManager" -> "Developer Manager" 
-        # (Capital letter following lowercase, but mostly for English words)
-        text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
+        })
         
-        # 2. Fix: "Experience.," -> "Experience ., " -> "Experience,"
-        # Add space after punctuation if missing
-        text = re.sub(r'([.,;:!?])([A-Za-z])', r'\1 \2', text)
+        # Display form of each skill, built once. .title() by default, hand-written where
+        # .title() gets it wrong ("Ci/Cd", "Aws", "Javascript")
+        self._skill_display = {s: s.title() for s in self.known_skills}
+        self._skill_display.update({
+            'javascript': 'JavaScript', 'typescript': 'TypeScript', 'sql': 'SQL', 'php': 'PHP',
+            'reactjs': 'ReactJS', 'vue.js': 'Vue.js', 'react.js': 'React.js', 'node.js': 'Node.js',
+            'nodejs': 'NodeJS', 'express.js': 'Express.js', 'next.js': 'Next.js', 'nextjs': 'NextJS',
+            'fastapi': 'FastAPI', 'tensorflow': 'TensorFlow', 'pytorch': 'PyTorch',
+            'scikit-learn': 'scikit-learn', 'numpy': 'NumPy',
+            'mongodb': 'MongoDB', 'mysql': 'MySQL', 'postgresql': 'PostgreSQL', 'dynamodb': 'DynamoDB',
+            'aws': 'AWS', 'gcp': 'GCP', 'ci/cd': 'CI/CD', 'github actions': 'GitHub Actions',
+            'github': 'GitHub', 'gitlab': 'GitLab', 'power bi': 'Power BI', 'powerbi': 'PowerBI',
+            'opencv': 'OpenCV', 'websocket': 'WebSocket', 'rest api': 'REST API', 'graphql': 'GraphQL',
+            'jwt': 'JWT', 'openai': 'OpenAI', 'langchain': 'LangChain',
+            'nlp': 'NLP', 'devops': 'DevOps', 'oop': 'OOP', 'oops': 'OOPs', 'etl': 'ETL', 'rag': 'RAG',
+        })
+
+        # Short skills ("c", "go", "sql") need word boundaries, longer ones are substring matches
+        self._short_skills = frozenset(s for s in self.known_skills if len(s) <= 3)
         
-        # 3. Fix: "1st", "2nd" being split
-        text = re.sub(r'(\d)(st|nd|rd|th)', r'\1\2', text)
+        # Aho-Corasick automaton over known_skills: one pass over a line finds every skill in it.
+        # Each hit carries (skill, needs_boundary_check) so the scan needs no extra lookups
+        self._skill_ac = ahocorasick.Automaton()
+        for skill in self.known_skills:
+            self._skill_ac.add_word(skill, (skill, skill in self._short_skills))
+        self._skill_ac.make_automaton()
+
+        # Spacing fixes for PDF extracted text, both applied in one pass by fix_spacing.
+        # Each alternative consumes only the character before the gap and looks ahead at
+        # the next one, so the fixes never hide each other ("x!aB" -> "x! a B").
+        self._spacing_re = re.compile(
+            # 1. Fix: "DeveloperManager" -> "Developer Manager"
+            # (Capital letter following lowercase, but mostly for English words)
+            r'[a-z](?=[A-Z])'
+            # 2. Fix: "Experience.," -> "Experience ., " -> "Experience,"
+            # Add space after punctuation if missing
+            r'|[.,;:!?](?=[A-Za-z])'
+        )
         
-        # 4. UNIVERSAL FIX: Repair common Tech Stack names damaged by step 1 or PDF extraction
+        # 3. UNIVERSAL FIX: Repair common Tech Stack names damaged by step 1 or PDF extraction
         # This list covers common technologies that are often CamelCase or have specific spacing
         replacements = {
             # Languages
@@ -155,51 +241,132 @@ class ResumeParser:
             r'Ci\s*/\s*Cd': 'CI/CD',
         }
         
-        for pattern, replacement in replacements.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        # All tech names are matched in a single pass; the named group that matched
+        # tells us which replacement to use.
+        self._tech_replacements = {}
+        tech_alternatives = []
+        for i, (pattern, replacement) in enumerate(replacements.items()):
+            self._tech_replacements[f'k{i}'] = replacement
+            tech_alternatives.append(f'(?P<k{i}>{pattern})')
+        self._tech_re = re.compile('|'.join(tech_alternatives), re.IGNORECASE)
+
+        # The one cache of parsed resumes, used by parse(), parse_many() and parse_bytes()
+        # (parsers.parse_upload). Entries are (text, parsed, Gemini result or None), keyed by
+        # extension and a hash of the file bytes, oldest evicted first. The parser is shared
+        # between request threads, hence the lock; entries themselves are never handed out,
+        # callers always get copies.
+        self._parse_cache = OrderedDict()
+        self._parse_cache_size = int(os.getenv("RESUME_CACHE_SIZE", "128"))
+        self._parse_cache_lock = threading.Lock()
+    
+    def fix_spacing(self, text):
+        """Fix spacing issues in PDF extracted text."""
+        
+        text = self._spacing_re.sub(r'\g<0> ', text)
+        
+        # Repair tech stack names (see __init__)
+        text = self._tech_re.sub(lambda m: self._tech_replacements[m.lastgroup], text)
             
         return text
     
-    def extract_text(self, file_path):
-        """Extract text from PDF or DOCX file."""
+    def extract_text(self, file_path, data=None):
+        """
+        Extract text from PDF or DOCX file.
+        If data (the file's bytes) is given it is parsed directly and file_path
+        is only used for its extension, so uploads need no temp file.
+        """
+        source = file_path if data is None else data
         if file_path.endswith('.pdf'):
-            text = ""
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
+            pages = []
+            pdf = pdfium.PdfDocument(source)
+            try:
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    # PDFium uses \r\n line breaks and marks soft hyphens with U+FFFE
+                    page_text = textpage.get_text_range().replace('\r\n', '\n').replace('\ufffe', '')
+                    textpage.close()
+                    page.close()
                     if page_text:
-                        text += page_text + "\n"
+                        pages.append(page_text + "\n")
+            finally:
+                pdf.close()
+            text = "".join(pages)
             # Fix spacing issues
             text = self.fix_spacing(text)
             return text
         
         elif file_path.endswith('.docx'):
-            doc = Document(file_path)
-            return "\n".join([p.text for p in doc.paragraphs])
+            return self._extract_docx_text(file_path if data is None else io.BytesIO(data))
         
         else:
             raise ValueError("Unsupported file format. Only PDF and DOCX are supported.")
     
-    def extract_basic_info(self, text):
+    def _extract_docx_text(self, source):
+        """
+        Read the body paragraphs of a DOCX straight from its XML, one line per paragraph.
+        Gives the same text as python-docx's doc.paragraphs without building its object model.
+        """
+        with zipfile.ZipFile(source) as z:
+            # The main part is usually word/document.xml; the package relationships say for sure
+            part = 'word/document.xml'
+            rels = ET.fromstring(z.read('_rels/.rels'))
+            for rel in rels:
+                if rel.get('Type') == _OFFICE_DOCUMENT_REL:
+                    part = posixpath.normpath(rel.get('Target').lstrip('/'))
+                    break
+            root = ET.fromstring(z.read(part))
+
+        body = root.find(_W + 'body')
+        paragraphs = []
+        for p in (body.iterfind(_W + 'p') if body is not None else ()):
+            parts = []
+            # Runs directly in the paragraph or inside hyperlinks, in document order
+            for child in p:
+                if child.tag == _W + 'r':
+                    runs = (child,)
+                elif child.tag == _W + 'hyperlink':
+                    runs = child.iterfind(_W + 'r')
+                else:
+                    continue
+                for r in runs:
+                    for e in r:
+                        if e.tag == _W + 't':
+                            parts.append(e.text or '')
+                        elif e.tag == _W + 'br':
+                            # Page and column breaks carry no text, only line breaks do
+                            if e.get(_W + 'type', 'textWrapping') == 'textWrapping':
+                                parts.append('\n')
+                        elif e.tag in _RUN_TEXT:
+                            parts.append(_RUN_TEXT[e.tag])
+            paragraphs.append(''.join(parts))
+        return "\n".join(paragraphs)
+
+    def _prepare_lines(self, text):
+        """Split text once into stripped non-empty lines and their lowercase forms."""
+        lines = [l for l in map(str.strip, text.split('\n')) if l]
+        lines_lower = [l.lower() for l in lines]
+        return lines, lines_lower
+    
+    def extract_basic_info(self, text, lines=None):
         """Extract name, email, and phone number."""
-        lines = [l.strip() for l in text.split('\n') if l.strip()]
+        if lines is None:
+            lines, _ = self._prepare_lines(text)
         
         # Extract email
         # email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(r"\S+@\S+", text)
+        email_match = self._email_re.search(text)
         email = email_match.group() if email_match else None
-        
-        # Extract phone (supports various formats)
-        phone_patterns = [
-            r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\b\d{10}\b',
-            r'\+\d{2}\s?\d{10}'
-        ]
+
+        # Extract phone (supports various formats), one pass over the text
+        phone_hits = {}
+        for m in self._phone_re.finditer(text):
+            phone_hits.setdefault(m.lastgroup, m.group(m.lastgroup))
+            if m.lastgroup == 'phone0':
+                break
         phone = None
-        for pattern in phone_patterns:
-            phone_match = re.search(pattern, text)
-            if phone_match:
-                phone = phone_match.group().strip()
+        for group in ('phone0', 'phone1', 'phone2'):
+            if group in phone_hits:
+                phone = phone_hits[group].strip()
                 break
         
         # Extract name (first non-empty line, excluding email/phone)
@@ -209,7 +376,7 @@ class ResumeParser:
                 continue
             if phone and phone in line:
                 continue
-            if re.search(r'\b(resume|cv|curriculum)\b', line, re.IGNORECASE):
+            if self._doc_title_re.search(line):
                 continue
             words = line.split()
             if 2 <= len(words) <= 4 and all(w.replace('.', '').isalpha() for w in words):
@@ -225,7 +392,7 @@ class ResumeParser:
             'phone': phone
         }
     
-    def split_into_sections(self, text):
+    def split_into_sections(self, text, lines=None, lines_lower=None):
         """Split resume text into sections and extract technologies from projects."""
         sections = {
             'education': [],
@@ -233,77 +400,97 @@ class ResumeParser:
             'projects': [],
             'skills': [],
             'achievements': [],
-            'project_technologies': [],  # ✅ New: Store tech found in projects
+            'project_technologies': set(),  # ✅ New: Store tech found in projects (deduplicated as found)
+            'skill_hits': set(),  # Skills found in the skills section, collected while splitting
             'raw_text': []
         }
         
         current_section = 'raw_text'
-        lines = text.split('\n')
+        if lines is None or lines_lower is None:
+            lines, lines_lower = self._prepare_lines(text)
         
-        for line in lines:
-            line_stripped = line.strip()
-            if not line_stripped:
-                continue
-            
-            # Check if line is a section header
-            line_lower = line_stripped.lower()
+        for line_stripped, line_lower in zip(lines, lines_lower):
+            # Check if line is a section header (headers are short lines)
             section_found = False
             
-            for section_name, pattern in self.section_patterns.items():
-                if re.search(pattern, line_lower, re.IGNORECASE) and len(line_stripped) < 50:
-                    current_section = section_name
+            if len(line_stripped) < 50:
+                header_match = self._section_re.match(line_lower)
+                if header_match:
+                    current_section = header_match.lastgroup
                     section_found = True
-                    break
             
             if not section_found:
                 sections[current_section].append(line_stripped)
                 
                 # ✅ If we're in projects section, extract technologies
                 if current_section == 'projects':
-                    self._extract_tech_from_line(line_stripped, sections['project_technologies'])
+                    self._extract_tech_from_line(line_stripped, sections['project_technologies'], line_lower)
+                elif current_section == 'skills':
+                    self._collect_line_skills(line_stripped, line_lower, sections['skill_hits'])
         
         return sections  
     
-    def extract_skills(self, skill_lines, project_techs, full_text):
-        """Extract technical skills from the skills section and merge with project technologies."""
-        skills = set()
-        
-        # Extract from skills section
-        for line in skill_lines:
-            line_lower = line.lower()
-            
-            # Check for each known skill
-            for skill in self.known_skills:
-                if len(skill) <= 3:
-                    # Word boundary for short words
-                    pattern = r'\b' + re.escape(skill) + r'\b'
-                    if re.search(pattern, line_lower):
-                        skills.add(skill.title())
-                else:
-                    if skill in line_lower:
-                        skills.add(skill.title())
-            
-            # Extract from comma/bullet separated lists
-            if any(sep in line for sep in [',', '•', '·', '-', ':']):
-                parts = re.split(r'[,•·:\-]', line)
-                for part in parts:
-                    part_clean = part.strip().lower()
-                    part_clean = re.sub(r'^(languages|frameworks|tools|databases|cloud)\s*', '', part_clean)
-                    if part_clean in self.known_skills and len(part_clean) > 2:
-                        skills.add(part.strip().title())
+    def _is_word_boundary(self, text, idx):
+        """Same test as regex \\b: a word char on exactly one side of position idx."""
+        before = idx > 0 and (text[idx - 1].isalnum() or text[idx - 1] == '_')
+        after = idx < len(text) and (text[idx].isalnum() or text[idx] == '_')
+        return before != after
+    
+    def _find_skills(self, text_lower, word_boundary=True):
+        """
+        Yield every known skill occurring in text_lower using the Aho-Corasick automaton.
+        Short skills (<= 3 chars) must sit on word boundaries unless word_boundary is False;
+        longer skills are plain substring matches.
+        """
+        for end, (skill, is_short) in self._skill_ac.iter(text_lower):
+            if word_boundary and is_short:
+                start = end - len(skill) + 1
+                if not (self._is_word_boundary(text_lower, start) and
+                        self._is_word_boundary(text_lower, end + 1)):
+                    continue
+            yield skill
+    
+    def _collect_line_skills(self, line, line_lower, skills):
+        """Add the known skills mentioned in one skills-section line to the skills set."""
+        # Check for each known skill
+        for skill in self._find_skills(line_lower):
+            skills.add(self._skill_display[skill])
+
+        # Extract from comma/bullet separated lists
+        if any(sep in line for sep in [',', '•', '·', '-', ':']):
+            parts = self._skill_sep_re.split(line)
+            for part in parts:
+                part_clean = part.strip().lower()
+                part_clean = self._skill_category_re.sub('', part_clean)
+                if part_clean in self.known_skills and len(part_clean) > 2:
+                    skills.add(self._skill_display[part_clean])
+
+    def extract_skills(self, skill_lines, project_techs, full_text, skill_hits=None, lines_lower=None):
+        """
+        Extract technical skills from the skills section and merge with project technologies.
+        skill_hits is the set split_into_sections already collected for skill_lines;
+        when given, the skills section is not scanned again. lines_lower are the lowercased
+        lines of full_text, used by the full-text fallback instead of lowering it again.
+        """
+        if skill_hits is not None:
+            skills = set(skill_hits)
+        else:
+            skills = set()
+            for line in skill_lines:
+                self._collect_line_skills(line, line.lower(), skills)
         
         # ✅ Add technologies found in projects
         for tech in project_techs:
-            skills.add(tech.title())
+            skills.add(self._skill_display.get(tech) or tech.title())
         
         # Also scan full text for skills if skills section is empty
         if not skills:
-            text_lower = full_text.lower()
-            for skill in self.known_skills:
-                if skill in text_lower:
-                    skills.add(skill.title())
+            # Skills never span a line break, so scanning line by line finds the same ones
+            for text_lower in (lines_lower if lines_lower is not None else (full_text.lower(),)):
+                for skill in self._find_skills(text_lower, word_boundary=False):
+                    skills.add(self._skill_display[skill])
         
-        return sorted(list(skills))
+        return sorted(skills)
   
     
     # def extract_education(self, edu_lines):
@@ -429,27 +616,22 @@ class ResumeParser:
                 i+=1
                 continue
 
-            degree_pattern = r'\b(b\.?\s*tech|bachelor|b\.?\s*e\.?|m\.?\s*tech|master|mba|bca|mca|phd)\b'
-            degree_match = re.search(degree_pattern, line, re.IGNORECASE)
-            # print("degree_match : ", degree_match)
-            if not degree_match:
-                degree_match = re.search(
-                    r'(b\.?tech|btech|b-tech|bachelor|b\.?e\.?|m\.?tech|mtech|master|mba|bca|mca|phd)',
-                    line,
-                    re.IGNORECASE
-                )
-                # print("degree_match 2 : ", degree_match)
+            # Every degree spelling starts with "b", "m" or "phd"; lines without them
+            # (dates, CGPA, addresses) can skip both degree regexes
+            degree_match = None
+            if 'b' in line_lower or 'm' in line_lower or 'phd' in line_lower:
+                degree_match = self._degree_re.search(line)
+                # print("degree_match : ", degree_match)
+                if not degree_match:
+                    degree_match = self._degree_loose_re.search(line)
+                    # print("degree_match 2 : ", degree_match)
 
             if degree_match:
                 if current_edu and 'course' in current_edu:
                     education_list.append(current_edu)
                     current_edu = {}
                 
-                specialization_match = re.search(
-                    r'(computer science|computer science and engineering (data science)|information technology|data science|electronics|mechanical|'
-                    r'electrical|civil|computer engineering)',
-                    line,
-                    re.IGNORECASE)
+                specialization_match = self._specialization_re.search(line)
 
                 degree = degree_match.group(0).strip()
                 # print("degree :(380) ", degree)
@@ -462,39 +644,29 @@ class ResumeParser:
 
             college_keywords = ['institute', 'university', 'college', 'academy']
             if any(keyword in line_lower for keyword in college_keywords) and 'college' not in current_edu:
-                college_match = re.search(
-                    r'([A-Z][a-zA-Z\s\.]+(?:institute|university|college|academy)[a-zA-Z\s,\.]*)',
-                    line,
-                    re.IGNORECASE
-                )
+                college_match = self._college_re.search(line)
 
                 if college_match:
+                    # The match only holds letters, whitespace, commas and dots, so years,
+                    # "Aug 2021" dates and "- Present" never make it in; only the spacing
+                    # and a trailing comma need cleaning
                     college_name = college_match.group(0).strip()
-
-                    college_name = re.sub(r'\b(20\d{2}|19\d{2})\b', '', college_name)
-                    college_name = re.sub(
-                        r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s*\d{4}',
-                        '',
-                        college_name,
-                        flags=re.IGNORECASE
-                    )
-                    college_name = re.sub(
-                        r'[–—-]\s*(present|current).*$', '',
-                        college_name,
-                        flags=re.IGNORECASE
-                    )
-                    college_name = re.sub(r'\s+', ' ', college_name).strip()
-                    college_name = re.sub(r',\s*$', '', college_name).strip()
+                    college_name = self._whitespace_re.sub(' ', college_name).strip()
+                    college_name = self._trailing_comma_re.sub('', college_name).strip()
 
                     current_edu['college'] = college_name
 
-            year_matches = re.findall(r'\b(20\d{2})\b', line)
-            if year_matches and 'graduation_year' not in current_edu:
-                current_edu['graduation_year'] = year_matches[-1]
-            
-            cgpa_match = re.search(r'cgpa[:\-\s]*([0-9.]+)', line_lower)
-            if cgpa_match:
-                current_edu['cgpa'] = cgpa_match.group(1)
+            year = cgpa = None
+            for m in self._edu_fields_re.finditer(line_lower):
+                if m.lastgroup == 'year':
+                    year = m.group('year')
+                elif cgpa is None:
+                    cgpa = m.group('cgpa')
+            if year and 'graduation_year' not in current_edu:
+                current_edu['graduation_year'] = year
+
+            if cgpa:
+                current_edu['cgpa'] = cgpa
             
             i += 1
 
@@ -586,35 +758,32 @@ class ResumeParser:
     #     return sorted(list(technologies))
 
 
-    def _extract_tech_from_line(self, line, tech_list):
-        """Helper method to extract technologies from a single line."""
-        line_lower = line.lower()
+    def _extract_tech_from_line(self, line, tech_set, line_lower=None):
+        """Helper method to add the technologies named in a single line to tech_set."""
         # tech_list = []
-        
+
+        # Most project lines are plain descriptions; skip the regex unless a trigger word
+        # is present. Non-ASCII lines always go through: re.IGNORECASE also matches
+        # letters like 'ſ' or 'ı' that lower() leaves alone.
+        if line_lower is None:
+            line_lower = line.lower()
+        if not ('tech' in line_lower or 'stack' in line_lower or 'built' in line_lower or not line.isascii()):
+            return
+
         # Pattern 1: Explicit "Tech:" or "Technologies Used:"
-        tech_pattern = r'(tech(?:nologies)?(?:\s+used)?|built\s+with|stack)[:\s]*(.+)'
-        match = re.search(tech_pattern, line, re.IGNORECASE)
+        match = self._tech_line_re.search(line)
         
         if match:
             tech_string = match.group(2)
             # Split by comma
-            techs = re.split(r'[,]', tech_string)
+            techs = tech_string.split(',')
             for tech in techs:
                 tech_clean = tech.strip().lower()
                 # Remove common words
-                tech_clean = re.sub(r'\b(and|or|with)\b', '', tech_clean).strip()
+                tech_clean = self._filler_words_re.sub('', tech_clean).strip()
                 
                 # Match against known skills
-                for known_skill in self.known_skills:
-                    if len(known_skill) <= 3:
-                        # For short words, require exact word match with word boundaries
-                        pattern = r'\b' + re.escape(known_skill) + r'\b'
-                        if re.search(pattern, tech_clean):
-                            tech_list.append(known_skill)
-                    else:
-                        # For longer words, substring match is fine
-                        if known_skill in tech_clean:
-                            tech_list.append(known_skill)
+                tech_set.update(self._find_skills(tech_clean))
         
 
     # def find_role_in_text(self, text):
@@ -742,10 +911,18 @@ class ResumeParser:
 
     def improve_with_gemini(self, text, extracted_json):
         """Use Gemini to format and enhance the extracted resume data."""
+        enhanced_json = self._enhance_with_gemini(text, extracted_json)
+        return extracted_json if enhanced_json is None else enhanced_json
+
+    def _enhance_with_gemini(self, text, extracted_json):
+        """
+        Gemini-enhanced version of extracted_json, or None when the enhancement did not
+        happen (no API key, google-genai missing, bad response or API error).
+        """
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             print("⚠️ GEMINI_API_KEY not found. Skipping LLM enhancement.")
-            return extracted_json
+            return None
         
         try:
             from google import genai
@@ -824,31 +1001,134 @@ class ResumeParser:
                 
         except ImportError:
             print("⚠️ google-genai not installed. Run: pip install google-genai")
-            return extracted_json
+            return None
         except json.JSONDecodeError as e:
             print(f"❌ Gemini returned invalid JSON: {e}")
             # print(f"Response: {result_text[:500]}")
-            return extracted_json
+            return None
         except Exception as e:
             print(f"❌ Gemini Error: {e}")
-            return extracted_json
+            return None
 
     def parse(self, file_path):
-        """Main parsing function."""
+        """
+        Main parsing function.
+        Results are cached by file content, so parsing the same resume again skips
+        extraction and parsing, and the Gemini call once it has succeeded. Every call
+        returns its own copy of the result.
+        """
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        key = self._parse_key(file_path, data)
+        entry = self._cached_parse_entry(key)
+        if entry is None or entry[2] is None:
+            entry = self._complete_parse_entry(file_path, data, entry)
+            self._store_parse_entry(key, entry)
+        return self._parse_entry_result(entry)
+
+    def parse_bytes(self, file_name, data):
+        """
+        Return (text, parsed data) for a file given as bytes, without the Gemini step.
+        Shares parse()'s cache; the returned dict is the caller's own copy.
+        """
+        key = self._parse_key(file_name, data)
+        entry = self._cached_parse_entry(key)
+        if entry is None:
+            entry = self._extract_parse_entry(file_name, data)
+            self._store_parse_entry(key, entry)
+        text, parsed, _ = entry
+        return text, copy.deepcopy(parsed)
+
+    def _parse_key(self, file_path, data):
+        """Parse cache key; the extension picks the extractor, so it is part of the key."""
+        return (os.path.splitext(file_path)[1], _content_hash(data).hexdigest())
+
+    def _cached_parse_entry(self, key):
+        with self._parse_cache_lock:
+            entry = self._parse_cache.get(key)
+            if entry is not None:
+                self._parse_cache.move_to_end(key)
+            return entry
+
+    def _store_parse_entry(self, key, entry):
+        with self._parse_cache_lock:
+            self._parse_cache[key] = entry
+            self._parse_cache.move_to_end(key)
+            while len(self._parse_cache) > self._parse_cache_size:
+                self._parse_cache.popitem(last=False)
+
+    def _extract_parse_entry(self, file_path, data):
+        """New parse cache entry: extracted text and parsed data, no Gemini result yet."""
         # Extract text
-        text = self.extract_text(file_path)
-        result = self.parse_text(text)
-        result = self.improve_with_gemini(text, result)
-        print("gemini result : ", result)
-        return result
+        text = self.extract_text(file_path, data)
+        return (text, self.parse_text(text), None)
+
+    def _complete_parse_entry(self, file_path, data, entry=None):
+        """
+        Fill in a parse cache entry (text, parsed, enhanced): extract and parse unless
+        entry already has them, and try Gemini unless it already succeeded. enhanced stays
+        None while Gemini fails, so a later call tries again.
+        """
+        if entry is None:
+            entry = self._extract_parse_entry(file_path, data)
+        text, parsed, enhanced = entry
+        if enhanced is None:
+            enhanced = self._enhance_with_gemini(text, parsed)
+            print("gemini result : ", parsed if enhanced is None else enhanced)
+        return (text, parsed, enhanced)
+
+    def _parse_entry_result(self, entry):
+        """The caller's result for a cache entry: a copy, so the cached dicts stay intact."""
+        _, parsed, enhanced = entry
+        return copy.deepcopy(parsed if enhanced is None else enhanced)
+
+    def parse_many(self, file_paths, max_workers=None):
+        """
+        Parse several resumes in parallel, returning results in the order of file_paths.
+        Extraction and regex matching hold the GIL, so the work is spread over processes;
+        each worker builds one ResumeParser and reuses it for every file it handles.
+        Cached files are answered here and the new results are added to this parser's cache.
+        """
+        results = [None] * len(file_paths)
+        # Uncached work by key: (file_path, data, cached entry without a Gemini result or None)
+        # and the result slots it fills; identical files in one call are parsed once
+        pending = {}
+        for i, file_path in enumerate(file_paths):
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            key = self._parse_key(file_path, data)
+            entry = self._cached_parse_entry(key)
+            if entry is not None and entry[2] is not None:
+                results[i] = self._parse_entry_result(entry)
+            elif key in pending:
+                pending[key][1].append(i)
+            else:
+                pending[key] = ((file_path, data, entry), [i])
+
+        if len(pending) == 1:
+            # Not worth starting a pool for a single file
+            entries = [self._complete_parse_entry(*job) for job, _ in pending.values()]
+        elif pending:
+            workers = min(max_workers or os.cpu_count() or 1, len(pending))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                # The bytes go along, so workers neither read nor hash the files again
+                entries = list(pool.map(_parse_in_worker, [job for job, _ in pending.values()]))
+        else:
+            entries = []
+        for (key, (_, slots)), entry in zip(pending.items(), entries):
+            self._store_parse_entry(key, entry)
+            for i in slots:
+                results[i] = self._parse_entry_result(entry)
+        return results
 
     def parse_text(self, text):
         """Parse structured data from text."""
         # Extract basic info
-        basic_info = self.extract_basic_info(text)
+        lines, lines_lower = self._prepare_lines(text)
+        basic_info = self.extract_basic_info(text, lines)
         
         # Split into sections
-        sections = self.split_into_sections(text)
+        sections = self.split_into_sections(text, lines, lines_lower)
         # print("projects : ", sections['projects'])
         # Extract structured data
         result = {
@@ -858,7 +1138,9 @@ class ResumeParser:
             'skills': self.extract_skills(
             sections['skills'], 
             sections['project_technologies'],  # ✅ Pass project techs
-            text
+            text,
+            sections['skill_hits'],
+            lines_lower
         ),
             'education': self.extract_education(sections['education']),
             # 'sentences': re.split(r'[.\n•]', text) if text else []
@@ -879,6 +1161,20 @@ class ResumeParser:
         return result
 
 
+# Per-process parser for ResumeParser.parse_many, built once by the pool initializer
+_worker_parser = None
+
+
+def _init_worker():
+    global _worker_parser
+    _worker_parser = ResumeParser()
+
+
+def _parse_in_worker(job):
+    """Complete one (file_path, data, entry) job; the entry goes back to the parent's cache."""
+    return _worker_parser._complete_parse_entry(*job)
+
+
 if __name__ == "__main__":
     from dotenv import load_dotenv
     load_dotenv()  # Load .env file
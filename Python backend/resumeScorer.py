@@ -1,8 +1,11 @@
 import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import blake2b
 from typing import List, Dict, Set, Tuple
-import torch
-from sentence_transformers import SentenceTransformer, util
-from model_utils import ModelManager
+import numpy as np
+from model_utils import ModelManager, cosine_similarity_matrix, prepare_for_similarity
 
 class JobDescriptionParser:
     """Parses job descriptions to extract skill requirements."""
@@ -19,26 +22,48 @@ class JobDescriptionParser:
                 r'plus', r'bonus', r'additional\s*skills?'
             ]
         }
-        # Use ResumeParser's known skills/extraction logic
-        from resumeParse import ResumeParser
-        self.skill_extractor = ResumeParser()
+        # Compiled once: header splitting (applied pattern by pattern, in order; each
+        # substitution sees the previous one's output, so they are kept separate) and
+        # header detection at the start of a line. Detection is one alternation with a
+        # group per section; alternatives are tried in the same order as the patterns.
+        self._header_split_res = [
+            re.compile(r'([\.\?!]|\b)\s*(' + pattern + r')[:\s]', re.IGNORECASE)
+            for patterns in self.sections_patterns.values() for pattern in patterns
+        ]
+        self._header_re = re.compile(
+            r'^\s*(?:' +
+            '|'.join('(?P<%s>%s)' % (section, '|'.join(patterns))
+                     for section, patterns in self.sections_patterns.items()) +
+            r')[:\s]*(?P<content>.*)'
+        )
+        # Use ResumeParser's known skills/extraction logic (shared instance)
+        from parsers import get_parser
+        self.skill_extractor = get_parser()
+        # parse() results by JD text, per parser (a method-level lru_cache would keep
+        # every parser alive)
+        self._parse_cached = lru_cache(maxsize=256)(self._parse_sections)
     
     def parse(self, text: str) -> Dict[str, List[str]]:
         """
         Parses the JD text and segments it into Must Have vs Good to Have.
         Returns extracted keywords for each category.
+        The same JD is usually scored against many resumes, so results are cached by text;
+        each call gets its own copy of the lists.
         """
+        return {key: list(skills) for key, skills in self._parse_cached(text).items()}
+
+    def _parse_sections(self, text: str) -> Dict[str, Tuple[str, ...]]:
         # Pre-process: Insert newlines before headers
-        for section, patterns in self.sections_patterns.items():
-            for pattern in patterns:
-                text = re.sub(r'([\.\?!]|\b)\s*(' + pattern + r')[:\s]', r'\n\2:', text, flags=re.IGNORECASE)
+        for header_re in self._header_split_res:
+            text = header_re.sub(r'\n\2:', text)
         
         lines = text.split('\n')
         
+        # Dicts used as insertion-ordered sets while collecting; frozen into tuples at the end
         parsed_data = {
-            'must_have': [],
-            'good_to_have': [],
-            'all_keywords': []
+            'must_have': {},
+            'good_to_have': {},
+            'all_keywords': {}
         }
         
         current_section = 'must_have' # Default
@@ -51,24 +76,18 @@ class JobDescriptionParser:
             line_lower = line_clean.lower()
             
             # Check for Header
-            is_header = False
-            for section, patterns in self.sections_patterns.items():
-                for pattern in patterns:
-                     if re.match(r'^\s*(' + pattern + r')[:\s]*(.*)', line_lower):
-                        current_section = section
-                        is_header = True
-                        content = re.match(r'^\s*(' + pattern + r')[:\s]*(.*)', line_lower).group(2).strip()
-                        if content:
-                            self._extract_keywords(content, current_section, parsed_data)
-                        break
-                if is_header: break
-            
-            if is_header:
+            header_match = self._header_re.match(line_lower)
+            if header_match:
+                current_section = next(section for section in self.sections_patterns
+                                       if header_match.group(section) is not None)
+                content = header_match.group('content').strip()
+                if content:
+                    self._extract_keywords(content, current_section, parsed_data)
                 continue
             
             self._extract_keywords(line_clean, current_section, parsed_data)
                     
-        return parsed_data
+        return {key: tuple(skills) for key, skills in parsed_data.items()}
 
     def _extract_keywords(self, text, section, parsed_data):
         # Use ResumeParser's logic to extract technical skills from the line
@@ -76,10 +95,8 @@ class JobDescriptionParser:
         extracted_skills = self.skill_extractor.extract_skills([text], [], "")
         
         for skill in extracted_skills:
-            if skill not in parsed_data[section]:
-                parsed_data[section].append(skill)
-            if skill not in parsed_data['all_keywords']:
-                parsed_data['all_keywords'].append(skill)
+            parsed_data[section].setdefault(skill, None)
+            parsed_data['all_keywords'].setdefault(skill, None)
                     
         return parsed_data
 
@@ -99,40 +116,82 @@ class ResumeScorer:
             "maintain", "architect", "create", "manage",
             "lead", "engineer", "test", "debug"
         }
+        # Matches if any action verb occurs in a (lowercased) sentence, as a substring
+        self._action_verb_re = re.compile('|'.join(re.escape(v) for v in sorted(self.ACTION_VERBS)))
         # Phase 3: Semantic Model
         # Load model only once using ModelManager
-        self.model = ModelManager().get_model()
+        self.model_manager = ModelManager()
+        self.model = self.model_manager.get_model()
+        # Sentence embeddings (prepared for similarity) keyed by a hash of the resume's
+        # sentences; the same resume is often scored against several JDs
+        self._sentence_cache = OrderedDict()
+        self._sentence_cache_size = 32
+        self._sentence_cache_lock = threading.Lock()
+        # JD skill embeddings, per scorer (a method-level lru_cache would keep every scorer
+        # alive); keyed by (model_id, skill) so a different encoder never reuses them
+        self._skill_embedding_cached = lru_cache(maxsize=1024)(self._encode_skill)
+    
+    def _encode_skill(self, model_id, skill: str):
+        return self.model_manager.encode_normalized(skill)
+
+    def _skill_embedding(self, skill: str):
+        """
+        Normalized embedding of a JD skill. The same skills show up in most JDs,
+        so embeddings are cached by skill text.
+        """
+        return self._skill_embedding_cached(self.model_manager.model_id, skill)
     
+    def _sentences_key(self, sentences: List[str]) -> bytes:
+        """Content hash of a sentence list (length-prefixed, so the split points count too)."""
+        h = blake2b(digest_size=16)
+        for sentence in sentences:
+            data = sentence.encode('utf-8', 'surrogatepass')
+            h.update(b'%d:' % len(data))
+            h.update(data)
+        return h.digest()
+
     def normalize_skill(self, skill: str) -> str:
         return skill.strip().lower()
 
-    def is_contextual(self, skill: str, sentences: List[str]) -> Dict:
+    def action_verb_sentences(self, sentences: List[str], sentences_lower: List[str] = None) -> List[Tuple[str, str]]:
+        """
+        (sentence, lowercased sentence) pairs, in order, for the non-empty sentences that
+        contain an action verb. Computed once per resume and shared by every is_contextual call.
+        """
+        if sentences_lower is None:
+            sentences_lower = [sentence.lower() for sentence in sentences]
+        return [
+            (sentence, sentence_lower)
+            for sentence, sentence_lower in zip(sentences, sentences_lower)
+            if sentence and self._action_verb_re.search(sentence_lower)
+        ]
+
+    def is_contextual(self, skill: str, sentences: List[str], sentences_lower: List[str] = None,
+                      verb_sentences: List[Tuple[str, str]] = None) -> Dict:
         """
         Check if a skill is used in a sentence with an action verb.
+        sentences_lower, if given, holds the sentences already lowercased, and verb_sentences
+        the result of action_verb_sentences for them.
         """
         skill_norm = self.normalize_skill(skill)
+        if verb_sentences is None:
+            verb_sentences = self.action_verb_sentences(sentences, sentences_lower)
         
-        for sentence in sentences:
-            if not sentence: continue
-            words = sentence.lower().split()
-            
+        for sentence, sentence_lower in verb_sentences:
             # Simple check if skill is in sentence
-            if skill_norm in sentence.lower():
-                # Check for action verbs in window
-                # Find index of skill (approximate)
-                try:
-                    # simplistic word match - better to find index of skill start
-                    # This is a heuristic.
-                     if any(v in sentence.lower() for v in self.ACTION_VERBS):
-                         return {"contextual": True, "evidence": sentence.strip()}
-                except:
-                    continue
+            # (simplistic substring match, like the verb check - this is a heuristic)
+            if skill_norm in sentence_lower:
+                return {"contextual": True, "evidence": sentence.strip()}
                     
         return {"contextual": False, "evidence": None}
 
-    def find_semantic_match(self, missing_jd_skill: str, resume_sentences: List[str], cached_sentence_embeddings=None) -> Dict:
+    def find_semantic_match(self, missing_jd_skill: str, resume_sentences: List[str], cached_sentence_embeddings=None,
+                            skill_embedding=None, cosine_scores=None, sentences_lower=None) -> Dict:
         """
         Use embeddings to find if a missing skill is implicitly present.
+        Precomputed (normalized) embeddings for the sentences and the skill can be passed in,
+        or directly the skill's cosine scores against every sentence (see score_batch),
+        as well as the lowercased sentences.
         """
         if not self.model or not resume_sentences:
             return {"match": False, "confidence": 0, "evidence": None}
@@ -141,11 +200,13 @@ class ResumeScorer:
 
         # 1. First check if the skill is literally mentioned in any sentence (Textual Recovery)
         # This is faster and more accurate for explicit mentions.
-        for sentence in resume_sentences:
+        if sentences_lower is None:
+            sentences_lower = [sentence.lower() for sentence in resume_sentences]
+        for sentence, sentence_lower in zip(resume_sentences, sentences_lower):
             if not sentence: continue
             # Basic word boundary check could be better, but simple substring is a good start
             # or use regex for word boundary
-            if skill_norm in sentence.lower():
+            if skill_norm in sentence_lower:
                  return {
                     "match": True,
                     "confidence": 1.0, # High confidence for explicit mention
@@ -154,21 +215,22 @@ class ResumeScorer:
 
         try:
             # 2. Semantic Embedding Check
-            # Encode missing skill
-            jd_embedding = self.model.encode(missing_jd_skill, convert_to_tensor=True)
-            
-            # Encode sentences (batch) or use cached
-            if cached_sentence_embeddings is not None:
-                sentence_embeddings = cached_sentence_embeddings
-            else:
-                sentence_embeddings = self.model.encode(resume_sentences, convert_to_tensor=True)
-            
-            # Compute cosine similarities
-            cosine_scores = util.cos_sim(jd_embedding, sentence_embeddings)[0]
+            if cosine_scores is None:
+                # Encode missing skill (or use the one batch-encoded in score())
+                jd_embedding = skill_embedding if skill_embedding is not None else self._skill_embedding(missing_jd_skill)
+
+                # Encode sentences (batch) or use cached (must be normalized, see score())
+                if cached_sentence_embeddings is not None:
+                    sentence_embeddings = cached_sentence_embeddings
+                else:
+                    sentence_embeddings = self.model_manager.encode_normalized(resume_sentences)
+
+                # Compute cosine similarities
+                cosine_scores = cosine_similarity_matrix(jd_embedding, sentence_embeddings)[0]
             
             # Find max similarity
-            max_score = torch.max(cosine_scores)
-            best_idx = torch.argmax(cosine_scores)
+            best_idx = int(cosine_scores.argmax())
+            max_score = cosine_scores[best_idx]
             
             if max_score > 0.60: # Lowered threshold based on testing (0.61 for explicit sentence)
                 return {
@@ -199,20 +261,89 @@ class ResumeScorer:
         """
         Calculates the relevance score with Rule-based, Contextual, and Semantic matching.
         """
-        resume_skills_set = {self.normalize_skill(s) for s in resume_skills}
-        
-        # Optimization: Pre-compute sentence embeddings once
-        cached_embeddings = None
-        if self.model and resume_sentences:
-            try:
-                cached_embeddings = self.model.encode(resume_sentences, convert_to_tensor=True)
-            except Exception as e:
-                print(f"Warning: Failed to pre-compute embeddings: {e}")
-        
+        return self.score_batch([(resume_skills, resume_sentences)], jd_data)[0]
+
+    def score_batch(self, candidates: List[Tuple[List[str], List[str]]], jd_data: Dict[str, List[str]]) -> List[Dict]:
+        """
+        Scores several resumes, given as (resume_skills, resume_sentences) pairs, against one JD.
+        Every candidate's sentences and missing skills share one encode call.
+        """
         # Refine JD skills
         must_have_skills = self.extract_skills_from_jd(jd_data['must_have'])
         good_to_have_skills = self.extract_skills_from_jd(jd_data['good_to_have'])
-        
+        jd_skills = must_have_skills | good_to_have_skills
+
+        skill_sets = [{self.normalize_skill(s) for s in skills} for skills, _ in candidates]
+        sentence_lists = [list(sentences) for _, sentences in candidates]
+
+        # Optimization: Pre-compute embeddings once. Skills missing from any resume and the
+        # sentences of resumes not in the sentence cache go through a single encode call
+        # (the model sorts by length internally, so padding stays small). One similarity
+        # matrix of missing skills against every sentence follows, and each candidate gets
+        # its slice of columns.
+        semantic_scores = [{} for _ in candidates]
+        if self.model and any(sentence_lists):
+            try:
+                missing_skills = sorted(set().union(*(
+                    jd_skills - skill_set
+                    for skill_set, sentences in zip(skill_sets, sentence_lists) if sentences
+                )))
+                if missing_skills:
+                    keys = [self._sentences_key(sentences) if sentences else None for sentences in sentence_lists]
+                    sentence_embeddings = {}
+                    with self._sentence_cache_lock:
+                        for key in keys:
+                            if key in self._sentence_cache:
+                                self._sentence_cache.move_to_end(key)
+                                sentence_embeddings[key] = self._sentence_cache[key]
+                    to_encode = {}
+                    for key, sentences in zip(keys, sentence_lists):
+                        if key is not None and key not in sentence_embeddings:
+                            to_encode.setdefault(key, sentences)
+
+                    new_sentences = [s for sentences in to_encode.values() for s in sentences]
+                    embeddings = self.model_manager.encode_normalized(missing_skills + new_sentences)
+                    embeddings = prepare_for_similarity(embeddings)
+                    offset = len(missing_skills)
+                    for key, sentences in to_encode.items():
+                        # Copied so the cache does not keep the whole batch array alive
+                        sentence_embeddings[key] = embeddings[offset:offset + len(sentences)].copy()
+                        offset += len(sentences)
+                    if to_encode:
+                        with self._sentence_cache_lock:
+                            for key in to_encode:
+                                self._sentence_cache[key] = sentence_embeddings[key]
+                            while len(self._sentence_cache) > self._sentence_cache_size:
+                                self._sentence_cache.popitem(last=False)
+
+                    similarities = cosine_similarity_matrix(
+                        embeddings[:len(missing_skills)],
+                        np.concatenate([sentence_embeddings[key] for key in keys if key is not None])
+                    )
+                    offset = 0
+                    for scores, sentences in zip(semantic_scores, sentence_lists):
+                        if sentences:
+                            block = similarities[:, offset:offset + len(sentences)]
+                            scores.update(zip(missing_skills, block))
+                            offset += len(sentences)
+            except Exception as e:
+                print(f"Warning: Failed to pre-compute embeddings: {e}")
+
+        return [
+            self._score_candidate(skill_set, sentences, must_have_skills, good_to_have_skills, scores)
+            for skill_set, sentences, scores in zip(skill_sets, sentence_lists, semantic_scores)
+        ]
+
+    def _score_candidate(self, resume_skills_set, resume_sentences, must_have_skills, good_to_have_skills,
+                         semantic_scores) -> Dict:
+        """
+        Score one resume. semantic_scores maps each missing JD skill to its cosine scores
+        against the resume's sentences (see score_batch).
+        """
+        # Lowercased once here instead of once per JD skill in the matchers
+        sentences_lower = [sentence.lower() for sentence in resume_sentences]
+        verb_sentences = None  # action_verb_sentences, computed on the first exact match
+
         # Lists for detailed report
         matches = {
             "exact": [],
@@ -224,55 +355,59 @@ class ResumeScorer:
         current_score = 0
         total_possible = 0
         
-        # Helper to process a skill group
-        def process_skills(target_skills, weight_category):
-            nonlocal current_score, total_possible
-            
-            category_weight = self.weights[weight_category]
+        # Both skill groups in one pass: must-have skills first, then good-to-have, each
+        # with its category weight. JD skills are already normalized (extract_skills_from_jd),
+        # so exact matches are a single set intersection.
+        must_have_weight = self.weights['must_have']
+        good_to_have_weight = self.weights['good_to_have']
+        target_skills = [(skill, must_have_weight) for skill in must_have_skills]
+        target_skills += [(skill, good_to_have_weight) for skill in good_to_have_skills]
+        exact_hits = (must_have_skills | good_to_have_skills) & resume_skills_set
+        
+        for skill, category_weight in target_skills:
+            # We normalize 1.0 as max per skill for easier math, then scale
             
-            for skill in target_skills:
-                skill_total_val = category_weight # Baselinen
-                # We normalize 1.0 as max per skill for easier math, then scale
+            # Check Exact Match
+            if skill in exact_hits:
+                # EXACT MATCH
+                # Check Contextual Bonus
+                if verb_sentences is None:
+                    verb_sentences = self.action_verb_sentences(resume_sentences, sentences_lower)
+                ctx = self.is_contextual(skill, resume_sentences, verb_sentences=verb_sentences)
+                score_boost = 1.0
                 
-                # Check Exact Match
-                if self.normalize_skill(skill) in resume_skills_set:
-                    # EXACT MATCH
-                    # Check Contextual Bonus
-                    ctx = self.is_contextual(skill, resume_sentences)
-                    score_boost = 1.0
-                    match_type = "Exact"
+                if ctx['contextual']:
+                    score_boost += 0.3
+                    matches['contextual'].append({"skill": skill, "evidence": ctx['evidence']})
                     
-                    if ctx['contextual']:
-                        score_boost += 0.3
-                        matches['contextual'].append({"skill": skill, "evidence": ctx['evidence']})
-                        
+                current_score += (category_weight * score_boost)
+                matches['exact'].append(skill)
+                
+            else:
+                # MISSING - Try Semantic Recovery
+                sem = self.find_semantic_match(
+                    skill, resume_sentences,
+                    cosine_scores=semantic_scores.get(skill),
+                    sentences_lower=sentences_lower
+                )
+                if sem['match']:
+                    # Recovered!
+                    score_boost = 0.6
                     current_score += (category_weight * score_boost)
-                    matches['exact'].append(skill)
-                    
+                    matches['semantic'].append({
+                        "skill": skill,
+                        "evidence": sem['evidence'],
+                        "confidence": sem['confidence']
+                    })
                 else:
-                    # MISSING - Try Semantic Recovery
-                    sem = self.find_semantic_match(skill, resume_sentences, cached_sentence_embeddings=cached_embeddings)
-                    if sem['match']:
-                        # Recovered!
-                        score_boost = 0.6
-                        current_score += (category_weight * score_boost)
-                        matches['semantic'].append({
-                            "skill": skill,
-                            "evidence": sem['evidence'],
-                            "confidence": sem['confidence']
-                        })
-                    else:
-                        matches['missing'].append(skill)
-                
-                # Update total possible (max potential for this skill was weight * (1.0 + 0.3))
-                # Actually, standardizing total possible:
-                # If we want 100% to be achievable with just exact matches, base total on 1.0 * weight
-                # Boosts allow >100% or help recover.
-                # Let's say Total Possible is simply Sum(Weights).
-                total_possible += category_weight
-
-        process_skills(must_have_skills, 'must_have')
-        process_skills(good_to_have_skills, 'good_to_have')
+                    matches['missing'].append(skill)
+            
+            # Update total possible (max potential for this skill was weight * (1.0 + 0.3))
+            # Actually, standardizing total possible:
+            # If we want 100% to be achievable with just exact matches, base total on 1.0 * weight
+            # Boosts allow >100% or help recover.
+            # Let's say Total Possible is simply Sum(Weights).
+            total_possible += category_weight
         
         # Calculate Final Score
         if total_possible == 0:
@@ -283,7 +418,7 @@ class ResumeScorer:
         # Phase 5: Penalties
         # if missing must have ratio > 0.4 -> penalize
         if must_have_skills:
-            missing_must = len([s for s in matches['missing'] if s in must_have_skills])
+            missing_must = sum(1 for s in matches['missing'] if s in must_have_skills)
             if (missing_must / len(must_have_skills)) > 0.4:
                 final_score *= 0.6
                 
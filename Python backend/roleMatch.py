@@ -1,34 +1,104 @@
+import hashlib
 import json
+import logging
+import os
+import threading
+from functools import lru_cache
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 
 from model_utils import ModelManager
 
-# Get shared model instance
-model = ModelManager().get_model()
+logger = logging.getLogger(__name__)
 
-with open("roles.json") as f:
-    roles = json.load(f)
+# Shared model manager; the model itself is loaded on first use
+model_manager = ModelManager()
 
-# Compute embeddings if model is available
-if model:
-    role_embeddings = model.encode([r["skills"] for r in roles])
-else:
-    role_embeddings = []
+with open("roles.json", "rb") as f:
+    roles_bytes = f.read()
+roles = json.loads(roles_bytes)
+
+
+def _load_role_embeddings():
+    """
+    L2-normalized embeddings of every role's skills. roles.json is static, so they are
+    saved next to it, keyed by a hash of the file and the encoder, and loaded from there
+    on later starts instead of being encoded again.
+    """
+    path = None
+    if model_manager.model_id is not None:
+        key = hashlib.sha1(roles_bytes + model_manager.model_id.encode()).hexdigest()
+        path = f"roles_emb_{key}.npy"
+    if path is not None and os.path.exists(path):
+        try:
+            return np.load(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable role embedding cache {path}: {e}")
+
+    embeddings = model_manager.encode_normalized([r["skills"] for r in roles])
+    embeddings = embeddings.detach().cpu().float().numpy()
+    if path is None:
+        # Unknown encoder: nothing to key the cache on
+        return embeddings
+    try:
+        # Written under a temporary name first so a concurrent start never reads half a file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, embeddings)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not save role embeddings to {path}: {e}")
+    return embeddings
+
+
+# Role embeddings are computed (or loaded) on the first recommendation, not at import,
+# so importing this module does not load the model
+_role_embeddings = None
+# recommend_roles runs in worker threads; the lock keeps the roles from being encoded
+# (or the .npy loaded) more than once. Model loading has its own lock in ModelManager.
+_role_embeddings_lock = threading.Lock()
+
+
+def _get_role_embeddings():
+    global _role_embeddings
+    if _role_embeddings is None:
+        with _role_embeddings_lock:
+            if _role_embeddings is None:
+                # Compute embeddings if model is available
+                _role_embeddings = _load_role_embeddings() if model_manager.get_model() else []
+    return _role_embeddings
+
+
+@lru_cache(maxsize=128)
+def _resume_embedding(resume_text):
+    """
+    Normalized embedding of a resume's full text. Repeat uploads of a resume get the
+    same text from parse_upload's cache, so their embedding is reused too.
+    """
+    embedding = model_manager.encode_normalized(resume_text)
+    embedding = embedding.detach().cpu().float().numpy()
+    embedding.flags.writeable = False  # shared between calls
+    return embedding
 
 
 def recommend_roles(resume_text, top_k=3):
-    resume_embedding = model.encode([resume_text])
-    scores = cosine_similarity(resume_embedding, role_embeddings)[0]
+    resume_embedding = _resume_embedding(resume_text)
+    # Both sides are normalized, so cosine similarity is a plain dot product
+    scores = _get_role_embeddings() @ resume_embedding
+
+    # Partial selection (O(N)) of the top_k-th best score, then sort only the roles at or
+    # above it. Ties are broken by roles.json order, as with the stable full sort before.
+    top_k = min(top_k, len(scores))
+    if top_k <= 0:
+        return []
+    kth_score = -np.partition(-scores, top_k - 1)[top_k - 1]
+    idx = np.flatnonzero(scores >= kth_score)
+    idx = idx[np.argsort(-scores[idx], kind="stable")][:top_k]
 
-    ranked = sorted(
-        zip(roles, scores),
-        key=lambda x: x[1],
-        reverse=True
-    )
+    # Round the selected scores in one call; float32 values are widened first so the
+    # result matches Python's round()
+    top_scores = np.round(scores[idx].astype(np.float64), 2).tolist()
 
     return [
-        {"role": r["role"], "score": round(float(score), 2)}
-        for r, score in ranked[:top_k]
+        {"role": roles[i]["role"], "score": score}
+        for i, score in zip(idx, top_scores)
     ]
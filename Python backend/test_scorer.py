@@ -60,5 +60,51 @@ def test_scoring():
     else:
          print("[WARNING] Contextual match NOT detected for Python.")
 
+def test_score_batch():
+    jd_data = {
+        'must_have': ['Python', 'Kubernetes'],
+        'good_to_have': ['React'],
+        'all_keywords': ['Python', 'Kubernetes', 'React']
+    }
+    # The resume without sentences sits in the middle, so a wrong offset when slicing
+    # the shared similarity matrix would shift the last resume's scores
+    candidates = [
+        (['Python', 'Django'], ["Deployed microservices on Kubernetes using Helm charts.", "Built responsive UI."]),
+        (['React'], []),
+        (['python'], ["Developed backend using Python"]),
+    ]
+    
+    print("\n--- Batch Score Test ---")
+    results = ResumeScorer().score_batch(candidates, jd_data)
+    for (skills, _), result in zip(candidates, results):
+        print(f"{skills}: {result['score']} ({result['verdict']})")
+    
+    # 1. Python exact; Kubernetes recovered from the sentence that mentions it
+    first = results[0]['breakdown']
+    assert first['exact'] == ['python']
+    k8s = [m for m in first['semantic'] if m['skill'] == 'kubernetes']
+    assert k8s and k8s[0]['evidence'] == "Deployed microservices on Kubernetes using Helm charts."
+    
+    # 2. No sentences: React exact, nothing recovered
+    second = results[1]['breakdown']
+    assert second['exact'] == ['react']
+    assert second['semantic'] == [] and second['contextual'] == []
+    assert sorted(second['missing']) == ['kubernetes', 'python']
+    
+    # 3. Python exact, and contextual thanks to "Developed"
+    third = results[2]['breakdown']
+    assert third['exact'] == ['python']
+    assert third['contextual'] == [{"skill": "python", "evidence": "Developed backend using Python"}]
+    
+    # Each batched result matches scoring that resume alone on a fresh scorer (empty caches)
+    for (skills, sentences), result in zip(candidates, results):
+        single = ResumeScorer().score(skills, jd_data, sentences)
+        assert abs(result['score'] - single['score']) < 1e-6
+        for kind in ('exact', 'contextual', 'missing'):
+            assert result['breakdown'][kind] == single['breakdown'][kind]
+        assert [m['skill'] for m in result['breakdown']['semantic']] == \
+            [m['skill'] for m in single['breakdown']['semantic']]
+
 if __name__ == "__main__":
     test_scoring()
+    test_score_batch()